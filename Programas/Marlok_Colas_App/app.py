@@ -1,3 +1,6 @@
+import os
+import time
+
 import streamlit as st
 import numpy as np
 import pandas as pd
@@ -7,19 +10,103 @@ from markov_chain import crear_matriz_transicion, simular_cadena_markov, calcula
 from queueing_theory import calcular_mm1_metrics, simular_mm1_fila
 from visualizations import plot_markov_path, plot_queue_occupancy, plot_state_distribution
 from decision_games import calcular_valor_esperado, matriz_pagos_a_dataframe, analizar_juego_normal_forma
-
-# --- Configuración y Título de la Aplicación ---
-st.set_page_config(layout="wide") # Opcional: para que la aplicación ocupe más ancho
-st.title("Explorador de Teorías: Markov, Colas y Decisiones/Juegos")
-st.sidebar.title("Navegación")
-
-# --- Menú en la barra lateral ---
-selected_theory = st.sidebar.radio(
-    "Elige una teoría para explorar:",
-    ["Cadenas de Markov", "Teoría de Colas", "Análisis de Decisiones y Juegos", "Conceptos Básicos", "Acerca de"]
-)
-
-if selected_theory == "Cadenas de Markov":
+from result_cache import ResultCache
+from background_jobs import GestorTareas
+import profiling
+
+# La página se dibuja en main(), que solo se ejecuta cuando Streamlit corre este archivo como __main__.
+# Los procesos del pool (contexto "spawn") vuelven a importar este archivo como __mp_main__:
+# así no repiten la página ni crean otro GestorTareas mientras arrancan.
+
+# --- Caché de resultados y tareas en segundo plano (compartidas por todas las sesiones) ---
+# Las simulaciones se ejecutan en un pool de procesos (uno por núcleo) para no competir por el GIL
+@st.cache_resource
+def obtener_gestor_tareas():
+    return GestorTareas(ResultCache(max_entradas=512, max_bytes=512 * 1024 * 1024))
+
+def control_semilla(clave):
+    """
+    Muestra la semilla de la simulación y un botón para sortear otra.
+    Con la misma semilla se reutiliza (desde la caché) la misma trayectoria; con otra se obtiene una muestra nueva.
+    :return: Tupla (semilla, True si se pidió una nueva simulación).
+    """
+    nueva = st.button("Nueva simulación (otra semilla)", key=f"btn_nueva_{clave}")
+    if nueva:
+        st.session_state[clave] = int(np.random.randint(0, 2**31 - 1))
+    semilla = st.number_input("Semilla aleatoria:", min_value=0, value=st.session_state.get(clave, 0), step=1, key=clave)
+    return int(semilla), nueva
+
+def lanzar_tarea(clave_sesion, funcion, *args, semilla=None):
+    """
+    Lanza una simulación en segundo plano y la asocia a la sesión actual.
+    Si la sesión tenía otra simulación en curso, se cancela.
+    """
+    anterior = st.session_state.get(clave_sesion)
+    if anterior is not None and not anterior.terminada():
+        anterior.cancelar()
+    st.session_state[clave_sesion] = obtener_gestor_tareas().enviar(funcion, *args, semilla=semilla)
+
+def mostrar_tarea(clave_sesion, texto):
+    """
+    Muestra el progreso de la tarea de la sesión y permite cancelarla.
+    Devuelve su resultado cuando termina, o None si no hay resultado que mostrar.
+    """
+    tarea = st.session_state.get(clave_sesion)
+    if tarea is None:
+        return None
+    tarea.esperar(timeout=0.2) # Las simulaciones cortas terminan sin llegar a mostrar la barra
+    if tarea.cancelada():
+        del st.session_state[clave_sesion]
+        st.warning("La simulación fue cancelada.")
+        return None
+    if not tarea.terminada():
+        st.progress(tarea.progreso, text=texto)
+        if st.button("Cancelar simulación", key=f"cancelar_{clave_sesion}"):
+            tarea.cancelar()
+            del st.session_state[clave_sesion]
+            st.warning("La simulación fue cancelada.")
+            return None
+        time.sleep(0.3)
+        st.rerun() # Vuelve a dibujar la página para actualizar el progreso
+    try:
+        return tarea.resultado()
+    except Exception as e:
+        del st.session_state[clave_sesion]
+        st.error(f"Ocurrió un error en la simulación: {e}")
+        return None
+
+# --- Panel de rendimiento en la barra lateral ---
+# Los controles afectan a todas las sesiones del servidor, así que solo se muestran
+# cuando el administrador arranca la aplicación con MARLOK_ADMIN=1; si no, el panel es de solo lectura.
+PANEL_ADMIN = os.environ.get("MARLOK_ADMIN", "") not in ("", "0")
+
+def panel_rendimiento(gestor_tareas):
+    with st.sidebar.expander("Rendimiento"):
+        st.caption("El perfilado y la caché son compartidos por todas las sesiones de este servidor.")
+        if not PANEL_ADMIN:
+            st.caption(f"Perfilado {'activado' if profiling.esta_activo() else 'desactivado'} (solo lectura).")
+        elif profiling.esta_activo():
+            if st.button("Desactivar perfilado", key="btn_perfil_desactivar"):
+                profiling.desactivar()
+                st.rerun()
+        elif st.button("Activar perfilado", key="btn_perfil_activar"):
+            profiling.activar()
+            st.rerun()
+
+        datos_perfil = profiling.informe()
+        if datos_perfil["funciones"]:
+            st.dataframe(pd.DataFrame.from_dict(datos_perfil["funciones"], orient="index"))
+        if datos_perfil["contadores"]:
+            st.json(datos_perfil["contadores"])
+        if PANEL_ADMIN and st.button("Reiniciar métricas", key="btn_perfil_reiniciar"):
+            profiling.reiniciar()
+            st.rerun()
+
+        st.write("Caché de resultados:")
+        st.json(gestor_tareas.cache.estadisticas())
+        st.write(f"Simulaciones en curso: {gestor_tareas.tareas_en_curso()}")
+
+def pagina_markov(cache):
     st.header("Cadenas de Markov")
     st.write("Aquí puedes explorar cómo los sistemas cambian de un estado a otro con probabilidades fijas.")
 
@@ -76,33 +163,43 @@ if selected_theory == "Cadenas de Markov":
         if not np.isclose(fila_suma, 1.0) and fila_suma > 0:
             st.warning(f"¡Advertencia! Las probabilidades desde {origen_nombre} no suman 1.0. Suman {fila_suma:.2f}")
 
-    if st.button("Calcular Matriz y Simular", key="btn_markov_simular"):
-        try:
-            matriz_transicion = crear_matriz_transicion(estados_nombres, probabilidades)
-            st.write("Matriz de Transición:")
-            st.dataframe(pd.DataFrame(matriz_transicion, index=estados_nombres, columns=estados_nombres))
+    st.subheader("Simulación y Análisis:")
+    # Los parámetros de la simulación van antes del botón para que sobrevivan a las recargas de la página
+    num_pasos_sim = st.slider("Número de pasos para simular:", 10, 200, 50, key="slider_markov_pasos_exec") # Cambié key para evitar conflicto
+    estado_inicial_sim = st.selectbox("Estado inicial para la simulación:", options=estados_nombres, key="select_markov_inicial_exec") # Cambié key
+    semilla_markov, nueva_markov = control_semilla("semilla_markov")
 
-            st.subheader("Simulación y Análisis:")
-            num_pasos_sim = st.slider("Número de pasos para simular:", 10, 200, 50, key="slider_markov_pasos_exec") # Cambié key para evitar conflicto
-            estado_inicial_sim = st.selectbox("Estado inicial para la simulación:", options=estados_nombres, key="select_markov_inicial_exec") # Cambié key
+    if st.button("Calcular Matriz y Simular", key="btn_markov_simular") or nueva_markov:
+        try:
+            matriz_transicion = cache.calcular(crear_matriz_transicion, estados_nombres, probabilidades)
             estado_inicial_idx = estados_nombres.index(estado_inicial_sim)
+            st.session_state.markov_parametros = (list(estados_nombres), matriz_transicion, estado_inicial_idx, num_pasos_sim)
+            lanzar_tarea("tarea_markov", simular_cadena_markov, matriz_transicion, estado_inicial_idx, num_pasos_sim, estados_nombres, semilla=semilla_markov)
+        except Exception as e:
+            st.error(f"Ocurrió un error: {e}. Por favor, revise sus entradas.")
+
+    camino_simulado = mostrar_tarea("tarea_markov", "Simulando cadena de Markov...")
+    if camino_simulado is not None:
+        try:
+            estados_sim, matriz_transicion, estado_inicial_idx, pasos_sim = st.session_state.markov_parametros
+            st.write("Matriz de Transición:")
+            st.dataframe(pd.DataFrame(matriz_transicion, index=estados_sim, columns=estados_sim))
 
-            camino_simulado = simular_cadena_markov(matriz_transicion, estado_inicial_idx, num_pasos_sim, estados_nombres)
             st.write(f"Camino simulado (primeros 20 pasos): {camino_simulado[:20]}...")
             plot_markov_path(camino_simulado, title="Simulación de Camino de Markov")
 
-            distribucion_inicial_arr = np.zeros(num_estados)
+            distribucion_inicial_arr = np.zeros(len(estados_sim))
             distribucion_inicial_arr[estado_inicial_idx] = 1.0
-            distribucion_final = calcular_distribucion_estado(matriz_transicion, distribucion_inicial_arr, num_pasos_sim)
+            distribucion_final = cache.calcular(calcular_distribucion_estado, matriz_transicion, distribucion_inicial_arr, pasos_sim)
             st.write("Distribución de probabilidad después de los pasos simulados:")
-            st.dataframe(pd.DataFrame({"Estado": estados_nombres, "Probabilidad": distribucion_final}))
-            plot_state_distribution(distribucion_final, estados_nombres, title="Distribución de Estados Final")
+            st.dataframe(pd.DataFrame({"Estado": estados_sim, "Probabilidad": distribucion_final}))
+            plot_state_distribution(distribucion_final, estados_sim, title="Distribución de Estados Final")
 
         except Exception as e:
             st.error(f"Ocurrió un error: {e}. Por favor, revise sus entradas.")
 
 
-elif selected_theory == "Teoría de Colas":
+def pagina_colas(cache):
     st.header("Teoría de Colas (M/M/1)")
     st.write("Explora cómo se comportan las colas en un sistema con llegadas aleatorias y un solo servidor.")
 
@@ -118,7 +215,7 @@ elif selected_theory == "Teoría de Colas":
     mu_val = st.number_input("Tasa de Servicio (μ):", min_value=0.1, value=st.session_state.get("mu_cola", 7.0), step=0.1, key="mu_cola")
 
     if st.button("Calcular Métricas", key="btn_calcular_metricas_cola"):
-        metrics = calcular_mm1_metrics(lambda_val, mu_val)
+        metrics = cache.calcular(calcular_mm1_metrics, lambda_val, mu_val)
         if "error" in metrics:
             st.error(metrics["error"])
         else:
@@ -128,13 +225,18 @@ elif selected_theory == "Teoría de Colas":
     st.subheader("Simulación de Cola M/M/1")
     sim_time = st.slider("Tiempo de Simulación:", min_value=10, max_value=500, value=st.session_state.get("sim_time_cola", 100), key="sim_time_cola")
 
-    if st.button("Simular Cola", key="btn_simular_cola"):
-        results = simular_mm1_fila(lambda_val, mu_val, sim_time)
+    semilla_cola, nueva_cola = control_semilla("semilla_cola")
+
+    if st.button("Simular Cola", key="btn_simular_cola") or nueva_cola:
+        lanzar_tarea("tarea_cola", simular_mm1_fila, lambda_val, mu_val, sim_time, semilla=semilla_cola)
+
+    results = mostrar_tarea("tarea_cola", "Simulando cola M/M/1...")
+    if results is not None:
         st.write("Resultados de la simulación (Tiempo, Clientes en sistema):")
         st.dataframe(pd.DataFrame(results, columns=["Tiempo", "Clientes en Sistema"]).head(20))
         plot_queue_occupancy(results, title="Ocupación de la Cola M/M/1 Simulada")
 
-elif selected_theory == "Análisis de Decisiones y Juegos":
+def pagina_decisiones_juegos(cache):
     st.header("Análisis de Decisiones y Juegos")
     st.write("Esta sección te ayuda a entender cómo tomar decisiones bajo incertidumbre y a analizar interacciones estratégicas en juegos.")
 
@@ -182,7 +284,7 @@ elif selected_theory == "Análisis de Decisiones y Juegos":
 
     if st.button("Calcular Valor Esperado", key="btn_calcular_ve"):
         try:
-            ve = calcular_valor_esperado(probabilidades_decision, resultados_decision)
+            ve = cache.calcular(calcular_valor_esperado, probabilidades_decision, resultados_decision)
             st.success(f"**El Valor Esperado de esta decisión es: {ve:.2f}**")
         except ValueError as e:
             st.error(f"Error en los datos: {e}")
@@ -259,7 +361,7 @@ elif selected_theory == "Análisis de Decisiones y Juegos":
             st.dataframe(df_pagos_j2)
 
             try:
-                analisis_result = analizar_juego_normal_forma(pagos_j1.tolist(), pagos_j2.tolist(), estrategias_j1, estrategias_j2)
+                analisis_result = cache.calcular(analizar_juego_normal_forma, pagos_j1.tolist(), pagos_j2.tolist(), estrategias_j1, estrategias_j2)
                 
                 if "error" in analisis_result:
                     st.error(analisis_result["error"])
@@ -277,7 +379,7 @@ elif selected_theory == "Análisis de Decisiones y Juegos":
             except Exception as e:
                 st.error(f"Ocurrió un error al analizar el juego: {e}")
 
-elif selected_theory == "Conceptos Básicos":
+def pagina_conceptos_basicos():
     st.header("Conceptos Básicos de las Teorías")
     st.write("Aquí encontrarás una breve introducción a cada teoría y su utilidad.")
 
@@ -344,8 +446,40 @@ elif selected_theory == "Conceptos Básicos":
     st.image("images/nash_equilibrium.png",
              caption="Matriz de Pagos de un Juego (Ejemplo de Equilibrio de Nash)")
 
-elif selected_theory == "Acerca de":
+def pagina_acerca_de():
     st.header("Acerca de esta Aplicación")
     st.write("Esta es una aplicación educativa para explorar conceptos fundamentales de Cadenas de Markov, Teoría de Colas y Análisis de Decisiones y Juegos.")
     st.write("Desarrollada con Python y Streamlit.")
-    st.write("¡Espero que te sea útil para entender estos complejos temas!")
\ No newline at end of file
+    st.write("¡Espero que te sea útil para entender estos complejos temas!")
+
+
+
+def main():
+    # --- Configuración y Título de la Aplicación ---
+    st.set_page_config(layout="wide") # Opcional: para que la aplicación ocupe más ancho
+    st.title("Explorador de Teorías: Markov, Colas y Decisiones/Juegos")
+    st.sidebar.title("Navegación")
+
+    gestor_tareas = obtener_gestor_tareas()
+    cache = gestor_tareas.cache
+
+    # --- Menú en la barra lateral ---
+    selected_theory = st.sidebar.radio(
+        "Elige una teoría para explorar:",
+        ["Cadenas de Markov", "Teoría de Colas", "Análisis de Decisiones y Juegos", "Conceptos Básicos", "Acerca de"]
+    )
+    panel_rendimiento(gestor_tareas)
+
+    if selected_theory == "Cadenas de Markov":
+        pagina_markov(cache)
+    elif selected_theory == "Teoría de Colas":
+        pagina_colas(cache)
+    elif selected_theory == "Análisis de Decisiones y Juegos":
+        pagina_decisiones_juegos(cache)
+    elif selected_theory == "Conceptos Básicos":
+        pagina_conceptos_basicos()
+    elif selected_theory == "Acerca de":
+        pagina_acerca_de()
+
+if __name__ == "__main__":
+    main()
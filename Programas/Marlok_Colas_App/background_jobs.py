@@ -0,0 +1,181 @@
+# background_jobs.py
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from result_cache import clave_parametros, congelar, entregar
+import profiling
+
+
+class TareaCancelada(Exception):
+    """Se lanza dentro de la función de progreso cuando la tarea ha sido cancelada."""
+
+
+class _Valor:
+    # Sustituto local de multiprocessing.Value para las tareas servidas desde la caché
+    def __init__(self, value):
+        self.value = value
+
+
+def _ejecutar_en_proceso(funcion, args, kwargs, semilla, progreso, cancelar, perfil_activo):
+    """
+    Punto de entrada en el proceso hijo. `progreso` y `cancelar` son objetos compartidos
+    (un Value y un Event de un Manager) con los que el proceso principal sigue y detiene la tarea.
+    :return: Tupla (resultado, datos de perfilado de esta tarea o None si el perfilado está desactivado).
+    """
+    # El perfilado se activa o desactiva en el proceso principal; el hijo sigue su estado actual
+    # y devuelve solo lo medido en esta tarea, que el principal acumula (ver GestorTareas._terminar)
+    if perfil_activo:
+        profiling.activar()
+        profiling.reiniciar()
+    else:
+        profiling.desactivar()
+
+    if semilla is not None:
+        import numpy as np
+        np.random.seed(semilla)
+
+    def reportar(fraccion):
+        if cancelar.is_set():
+            raise TareaCancelada()
+        progreso.value = min(max(float(fraccion), 0.0), 1.0)
+
+    resultado = funcion(*args, progreso=reportar, **kwargs)
+    progreso.value = 1.0
+    return resultado, profiling.exportar() if perfil_activo else None
+
+
+class Tarea:
+    """
+    Cálculo lanzado en segundo plano. Expone su progreso (0.0 - 1.0), permite cancelarlo
+    y, al terminar, devuelve el resultado o relanza la excepción producida.
+    """
+
+    def __init__(self, clave, progreso, cancelar):
+        self.clave = clave
+        self.future = None
+        self._progreso = progreso
+        self._cancelar = cancelar
+        self._interesados = 1
+        self._lock = threading.Lock()
+
+    @property
+    def progreso(self):
+        if self.future is not None and self.future.done():
+            return 1.0
+        try:
+            return self._progreso.value
+        except (EOFError, OSError):
+            # El Manager ya se cerró (por ejemplo, al apagar el servidor)
+            return 0.0
+
+    def _agregar_interesado(self):
+        with self._lock:
+            self._interesados += 1
+
+    def cancelar(self):
+        """
+        Retira el interés de quien llama. La tarea solo se detiene cuando nadie más
+        (por ejemplo, otra sesión con los mismos parámetros) espera su resultado.
+        """
+        with self._lock:
+            self._interesados -= 1
+            if self._interesados <= 0:
+                self._cancelar.set()
+                self.future.cancel()
+
+    def terminada(self):
+        return self.future.done()
+
+    def cancelada(self):
+        if not self.future.done():
+            return False
+        return self.future.cancelled() or isinstance(self.future.exception(), TareaCancelada)
+
+    def esperar(self, timeout=None):
+        """Espera a que termine la tarea como máximo `timeout` segundos. Devuelve si terminó."""
+        try:
+            self.future.exception(timeout=timeout)
+        except Exception:
+            pass
+        return self.future.done()
+
+    def resultado(self):
+        # La misma tarea puede compartirse entre sesiones: se entrega congelada, como desde la caché
+        return entregar(congelar(self.future.result()[0]))
+
+
+class GestorTareas:
+    """
+    Ejecuta cálculos largos en un pool de procesos compartido y guarda los resultados en una ResultCache.
+    Las simulaciones son bucles de Python que no liberan el GIL, así que se usan procesos para
+    repartirlas entre los núcleos. El progreso y la cancelación viajan por un Manager.
+    Si ya hay una tarea en curso con los mismos parámetros, se reutiliza en lugar de lanzar otra.
+    """
+
+    def __init__(self, cache, max_workers=None):
+        self.cache = cache
+        # "spawn" evita hacer fork de un proceso con hilos (el servidor de Streamlit) y funciona igual en Windows
+        contexto = multiprocessing.get_context("spawn")
+        self._manager = contexto.Manager()
+        self._pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=contexto)
+        self._en_curso = {}  # clave -> Tarea
+        self._lock = threading.Lock()
+
+    def enviar(self, funcion, *args, semilla=None, **kwargs):
+        """
+        Lanza funcion(*args, **kwargs, progreso=...) en un proceso del pool.
+        La función debe aceptar el parámetro `progreso` (ver simular_cadena_markov y simular_mm1_fila)
+        y poder importarse desde su módulo. `semilla` inicializa numpy.random en el proceso hijo
+        y forma parte de la clave de caché: la misma semilla reproduce la misma trayectoria
+        y una semilla nueva produce una muestra nueva.
+        :return: Tarea asociada al cálculo.
+        """
+        clave = clave_parametros(funcion.__name__, *args, semilla=semilla, **kwargs)
+        with self._lock:
+            tarea = self._en_curso.get(clave)
+            if tarea is not None and not tarea._cancelar.is_set():
+                tarea._agregar_interesado()
+                return tarea
+
+            guardado = self.cache.obtener(clave, por_defecto=_SIN_RESULTADO)
+            if guardado is not _SIN_RESULTADO:
+                tarea = Tarea(clave, _Valor(1.0), threading.Event())
+                tarea.future = Future()
+                tarea.future.set_result((guardado, None))
+                return tarea
+
+            tarea = Tarea(clave, self._manager.Value("d", 0.0), self._manager.Event())
+            tarea.future = self._pool.submit(_ejecutar_en_proceso, funcion, args, kwargs, semilla,
+                                             tarea._progreso, tarea._cancelar, profiling.esta_activo())
+            self._en_curso[clave] = tarea
+        # Fuera del lock: si la tarea ya terminó, el callback se ejecuta en el acto
+        tarea.future.add_done_callback(lambda _: self._terminar(tarea))
+        return tarea
+
+    def _terminar(self, tarea):
+        # Primero se guarda el resultado y el perfilado: cuando la tarea deja de contar
+        # como en curso, ambos ya son visibles para las demás sesiones
+        if not tarea.future.cancelled() and tarea.future.exception() is None:
+            resultado, perfil = tarea.future.result()
+            if perfil is not None:
+                profiling.combinar(perfil)
+            self.cache.guardar(tarea.clave, resultado)
+        with self._lock:
+            if self._en_curso.get(tarea.clave) is tarea:
+                del self._en_curso[tarea.clave]
+
+    def tareas_en_curso(self):
+        with self._lock:
+            return len(self._en_curso)
+
+    def cerrar(self):
+        with self._lock:
+            for tarea in self._en_curso.values():
+                tarea._cancelar.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._manager.shutdown()
+
+
+_SIN_RESULTADO = object()
@@ -0,0 +1,397 @@
+# batch_runner.py
+#
+# Ejecución no interactiva de escenarios de Markov, colas y juegos.
+# Lee un archivo de escenarios (JSON, YAML o CSV), los ejecuta en paralelo en un pool de
+# procesos y escribe cada resultado en CSV o Parquet en cuanto termina.
+#
+# Uso (desde Programas/Marlok_Colas_App):
+#     python batch_runner.py escenarios.json resultados.csv [--procesos 4] [--reanudar] [--perfil]
+#
+# Formato de cada escenario (en CSV, los campos con listas o matrices van como JSON):
+#     {"id": "clima", "tipo": "markov", "estados": ["Soleado", "Nublado"],
+#      "matriz": [[0.8, 0.2], [0.4, 0.6]], "estado_inicial": "Soleado", "pasos": 100}
+#     {"id": "banco", "tipo": "cola", "lambda": 5, "mu": 7, "tiempo_simulacion": 200}
+#     {"id": "dilema", "tipo": "juego", "estrategias_j1": ["C", "D"], "estrategias_j2": ["C", "D"],
+#      "pagos_j1": [[3, 0], [5, 1]], "pagos_j2": [[3, 5], [0, 1]]}
+# El campo opcional "semilla" fija el generador aleatorio; si falta, se deriva del id.
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from markov_chain import crear_matriz_transicion, simular_cadena_markov, calcular_distribucion_estado
+from queueing_theory import calcular_mm1_metrics, simular_mm1_fila
+from decision_games import analizar_juego_normal_forma
+import profiling
+
+COLUMNAS = ["id", "tipo", "estado", "duracion_s", "resultado", "error"]
+
+
+# --- Lectura de escenarios ---
+
+def _valor_csv(texto):
+    # Solo las celdas con listas u objetos se interpretan como JSON. El resto queda como texto
+    # (los ejecutores convierten los números) para que un estado llamado "1" siga siendo un nombre.
+    if texto.lstrip().startswith(("[", "{")):
+        return json.loads(texto)
+    return texto
+
+def cargar_escenarios(ruta):
+    """
+    Lee un archivo de escenarios en formato JSON, YAML o CSV (según la extensión).
+    :return: Lista de diccionarios, cada uno con un "id" único.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    with open(ruta, encoding="utf-8", newline="") as f:
+        if extension == ".json":
+            datos = json.load(f)
+        elif extension in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("Para leer escenarios en YAML instala PyYAML (pip install pyyaml).")
+            datos = yaml.safe_load(f)
+        elif extension == ".csv":
+            datos = [{k: _valor_csv(v) for k, v in fila.items() if v not in (None, "")}
+                     for fila in csv.DictReader(f)]
+        else:
+            raise ValueError(f"Formato de escenarios no soportado: {extension} (use .json, .yaml o .csv)")
+
+    if isinstance(datos, dict):
+        datos = datos.get("escenarios", [])
+    escenarios = []
+    vistos = set()
+    for i, escenario in enumerate(datos):
+        escenario = dict(escenario)
+        escenario["id"] = str(escenario.get("id", i))
+        if escenario["id"] in vistos:
+            raise ValueError(f"El id de escenario '{escenario['id']}' está repetido.")
+        vistos.add(escenario["id"])
+        escenarios.append(escenario)
+    return escenarios
+
+
+# --- Ejecución de un escenario (se ejecuta en un proceso del pool) ---
+
+def _semilla(escenario):
+    if "semilla" in escenario:
+        return int(escenario["semilla"])
+    return int(hashlib.sha1(escenario["id"].encode("utf-8")).hexdigest()[:8], 16)
+
+def _indice_estado(estados, estado):
+    # Primero se busca como nombre de estado y solo si no existe se interpreta como índice
+    nombres = [str(e) for e in estados]
+    if str(estado) in nombres:
+        return nombres.index(str(estado))
+    indice = int(estado)
+    if not 0 <= indice < len(estados):
+        raise ValueError(f"Estado inicial desconocido: {estado!r}")
+    return indice
+
+def _ejecutar_markov(escenario):
+    estados = escenario["estados"]
+    if "matriz" in escenario:
+        matriz = np.array(escenario["matriz"], dtype=float)
+    else:
+        matriz = crear_matriz_transicion(estados, escenario["probabilidades"])
+    estado_inicial_idx = _indice_estado(estados, escenario.get("estado_inicial", 0))
+    pasos = int(escenario.get("pasos", 50))
+
+    camino = simular_cadena_markov(matriz, estado_inicial_idx, pasos)
+    distribucion_inicial = np.zeros(len(estados))
+    distribucion_inicial[estado_inicial_idx] = 1.0
+    distribucion_final = calcular_distribucion_estado(matriz, distribucion_inicial, pasos)
+    frecuencias = np.bincount(camino, minlength=len(estados)) / len(camino)
+    return {
+        "distribucion_final": dict(zip(estados, distribucion_final.tolist())),
+        "frecuencias_simuladas": dict(zip(estados, frecuencias.tolist())),
+        "estado_final_simulado": estados[camino[-1]],
+    }
+
+def _ejecutar_cola(escenario):
+    lambda_llegadas = float(escenario["lambda"])
+    mu_servicio = float(escenario["mu"])
+    resultado = calcular_mm1_metrics(lambda_llegadas, mu_servicio)
+    if "error" in resultado:
+        raise ValueError(resultado["error"])
+    if "tiempo_simulacion" in escenario:
+        datos = np.asarray(simular_mm1_fila(lambda_llegadas, mu_servicio, float(escenario["tiempo_simulacion"])))
+        tiempos, clientes = datos[:, 0], datos[:, 1]
+        duraciones = np.diff(tiempos)
+        resultado["num_eventos_simulados"] = len(datos) - 1
+        # Promedio de clientes ponderado por el tiempo que el sistema pasa en cada estado
+        resultado["num_promedio_sistema_simulado"] = float(np.sum(clientes[:-1] * duraciones) / tiempos[-1]) if tiempos[-1] > 0 else 0.0
+    return resultado
+
+def _ejecutar_juego(escenario):
+    resultado = analizar_juego_normal_forma(escenario["pagos_j1"], escenario["pagos_j2"],
+                                            escenario["estrategias_j1"], escenario["estrategias_j2"])
+    if "error" in resultado:
+        raise ValueError(resultado["error"])
+    return resultado
+
+EJECUTORES = {
+    "markov": _ejecutar_markov,
+    "cola": _ejecutar_cola,
+    "juego": _ejecutar_juego,
+}
+
+def ejecutar_escenario(escenario):
+    """
+    Ejecuta un escenario y devuelve la fila de resultados, midiendo su duración.
+    Los errores del escenario se registran en la fila en lugar de interrumpir el lote.
+    """
+    fila = {"id": escenario["id"], "tipo": escenario.get("tipo", ""), "estado": "ok", "resultado": "", "error": ""}
+    if profiling.esta_activo():
+        profiling.reiniciar()
+    inicio = time.perf_counter()
+    try:
+        ejecutor = EJECUTORES.get(fila["tipo"])
+        if ejecutor is None:
+            raise ValueError(f"Tipo de escenario desconocido: '{fila['tipo']}' (use markov, cola o juego)")
+        np.random.seed(_semilla(escenario))
+        fila["resultado"] = json.dumps(ejecutor(escenario), ensure_ascii=False, default=str)
+    except Exception as e:
+        fila["estado"] = "error"
+        fila["error"] = f"{type(e).__name__}: {e}"
+    fila["duracion_s"] = time.perf_counter() - inicio
+    if profiling.esta_activo():
+        # Los datos del perfilado viajan con la fila; el proceso principal los acumula
+        fila["perfil"] = profiling.exportar()
+    return fila
+
+
+# --- Escritura de resultados ---
+
+class EscritorCSV:
+    """Añade cada fila al CSV en cuanto llega, de modo que un corte no pierde lo ya escrito."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+
+    def ids_completados(self):
+        if not os.path.exists(self.ruta):
+            return set()
+        # Si el proceso se cortó a mitad de una fila, se descarta esa fila incompleta
+        with open(self.ruta, "rb+") as f:
+            contenido = f.read()
+            if contenido and not contenido.endswith(b"\n"):
+                f.truncate(contenido.rfind(b"\n") + 1)
+        with open(self.ruta, encoding="utf-8", newline="") as f:
+            return {fila["id"] for fila in csv.DictReader(f)}
+
+    def abrir(self):
+        nuevo = not os.path.exists(self.ruta) or os.path.getsize(self.ruta) == 0
+        self._archivo = open(self.ruta, "a", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._archivo, fieldnames=COLUMNAS)
+        if nuevo:
+            self._writer.writeheader()
+
+    def escribir(self, fila):
+        self._writer.writerow(fila)
+        self._archivo.flush()
+
+    def cerrar(self):
+        self._archivo.close()
+
+
+class EscritorParquet:
+    """
+    Escribe los resultados en un directorio de archivos Parquet (part-00000.parquet, ...).
+    Las filas se agrupan en bloques (por número de filas o por tiempo) y cada bloque es un archivo nuevo.
+    Mientras un bloque se completa, cada fila se añade también a un registro JSON Lines
+    (pendientes.jsonl), así que una interrupción no pierde ningún resultado ya calculado:
+    al reanudar, las filas del registro se recuperan y se escriben en el siguiente bloque.
+    """
+
+    NOMBRE_REGISTRO = "pendientes.jsonl"
+
+    def __init__(self, ruta, filas_por_archivo=200, segundos_por_archivo=10.0):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Para escribir resultados en Parquet instala pyarrow (pip install pyarrow).")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.ruta = ruta
+        self.filas_por_archivo = filas_por_archivo
+        self.segundos_por_archivo = segundos_por_archivo
+        self._pendientes = []
+        self._registro = None
+
+    def _partes(self):
+        if not os.path.isdir(self.ruta):
+            return []
+        return sorted(n for n in os.listdir(self.ruta) if n.startswith("part-") and n.endswith(".parquet"))
+
+    def _ids_en_partes(self):
+        ids = set()
+        for nombre in self._partes():
+            ids.update(self._pq.read_table(os.path.join(self.ruta, nombre), columns=["id"]).column("id").to_pylist())
+        return ids
+
+    def _filas_registro(self):
+        ruta_registro = os.path.join(self.ruta, self.NOMBRE_REGISTRO)
+        if not os.path.exists(ruta_registro):
+            return []
+        filas = []
+        with open(ruta_registro, encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    filas.append(json.loads(linea))
+                except ValueError:
+                    # Última línea cortada por la interrupción: esa fila se vuelve a calcular
+                    break
+        return filas
+
+    def ids_completados(self):
+        return self._ids_en_partes() | {fila["id"] for fila in self._filas_registro()}
+
+    def abrir(self):
+        os.makedirs(self.ruta, exist_ok=True)
+        self._siguiente = len(self._partes())
+        # Recupera las filas de una ejecución interrumpida (salvo las que ya llegaron a un bloque)
+        en_partes = self._ids_en_partes()
+        self._pendientes = [fila for fila in self._filas_registro() if fila["id"] not in en_partes]
+        self._registro = open(os.path.join(self.ruta, self.NOMBRE_REGISTRO), "w", encoding="utf-8")
+        for fila in self._pendientes:
+            self._registro.write(json.dumps(fila, ensure_ascii=False) + "\n")
+        self._registro.flush()
+        self._ultimo_volcado = time.monotonic()
+
+    def escribir(self, fila):
+        self._registro.write(json.dumps(fila, ensure_ascii=False) + "\n")
+        self._registro.flush()
+        self._pendientes.append(fila)
+        if (len(self._pendientes) >= self.filas_por_archivo
+                or time.monotonic() - self._ultimo_volcado >= self.segundos_por_archivo):
+            self._volcar()
+
+    def _volcar(self):
+        if not self._pendientes:
+            return
+        tabla = self._pa.table({c: [f[c] for f in self._pendientes] for c in COLUMNAS})
+        destino = os.path.join(self.ruta, f"part-{self._siguiente:05d}.parquet")
+        # Se escribe a un temporal y se renombra para no dejar archivos a medias
+        self._pq.write_table(tabla, destino + ".tmp")
+        os.replace(destino + ".tmp", destino)
+        self._siguiente += 1
+        self._pendientes = []
+        # Las filas ya están en el bloque: se vacía el registro
+        self._registro.seek(0)
+        self._registro.truncate()
+        self._ultimo_volcado = time.monotonic()
+
+    def cerrar(self):
+        self._volcar()
+        self._registro.close()
+        os.remove(os.path.join(self.ruta, self.NOMBRE_REGISTRO))
+
+
+def crear_escritor(ruta):
+    if ruta.lower().endswith(".csv"):
+        return EscritorCSV(ruta)
+    if ruta.lower().endswith(".parquet"):
+        return EscritorParquet(ruta)
+    raise ValueError(f"Formato de salida no soportado: {ruta} (use .csv o .parquet)")
+
+
+# --- Lote ---
+
+def ejecutar_lote(escenarios, escritor, procesos=None, progreso=None):
+    """
+    Ejecuta los escenarios en un pool de procesos y escribe cada resultado en cuanto termina.
+    Se mantienen como mucho unas pocas tareas por proceso en vuelo para acotar la memoria.
+    :param progreso: Función opcional que recibe cada fila terminada.
+    :return: Número de escenarios ejecutados.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    max_en_vuelo = procesos * 4
+    pendientes = iter(escenarios)
+    completados = 0
+    escritor.abrir()
+    try:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            en_vuelo = set()
+            try:
+                while True:
+                    for escenario in pendientes:
+                        en_vuelo.add(pool.submit(ejecutar_escenario, escenario))
+                        if len(en_vuelo) >= max_en_vuelo:
+                            break
+                    if not en_vuelo:
+                        break
+                    terminados, en_vuelo = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                    for future in terminados:
+                        fila = future.result()
+                        perfil = fila.pop("perfil", None)
+                        if perfil is not None:
+                            profiling.combinar(perfil)
+                        escritor.escribir(fila)
+                        completados += 1
+                        if progreso is not None:
+                            progreso(fila)
+            except BaseException:
+                for future in en_vuelo:
+                    future.cancel()
+                raise
+    finally:
+        escritor.cerrar()
+    return completados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ejecuta un lote de escenarios de Markov, colas y juegos.")
+    parser.add_argument("escenarios", help="Archivo de escenarios (.json, .yaml, .yml o .csv)")
+    parser.add_argument("salida", help="Archivo de resultados (.csv) o directorio Parquet (.parquet)")
+    parser.add_argument("--procesos", type=int, default=None, help="Número de procesos (por defecto, uno por CPU)")
+    parser.add_argument("--reanudar", action="store_true", help="Omite los escenarios que ya están en la salida")
+    parser.add_argument("--perfil", action="store_true", help="Mide las funciones de cálculo y muestra un informe al final")
+    args = parser.parse_args(argv)
+
+    if args.perfil:
+        # La variable de entorno activa el perfilado también en los procesos del pool
+        os.environ["MARLOK_PERFIL"] = "1"
+        profiling.activar()
+
+    escenarios = cargar_escenarios(args.escenarios)
+    escritor = crear_escritor(args.salida)
+
+    completados = escritor.ids_completados()
+    if completados and not args.reanudar:
+        print(f"La salida {args.salida} ya contiene resultados. Use --reanudar para continuar el lote.")
+        return 1
+    restantes = [e for e in escenarios if e["id"] not in completados]
+    print(f"{len(escenarios)} escenarios, {len(escenarios) - len(restantes)} ya completados, {len(restantes)} por ejecutar.")
+
+    inicio = time.perf_counter()
+    errores = 0
+
+    def informar(fila):
+        nonlocal errores
+        if fila["estado"] != "ok":
+            errores += 1
+            print(f"[{fila['id']}] error: {fila['error']}")
+
+    try:
+        ejecutados = ejecutar_lote(restantes, escritor, args.procesos, progreso=informar)
+    except KeyboardInterrupt:
+        print("\nLote interrumpido. Vuelva a ejecutar con --reanudar para continuar.")
+        return 130
+    print(f"{ejecutados} escenarios ejecutados en {time.perf_counter() - inicio:.2f} s ({errores} con error).")
+    if args.perfil:
+        print()
+        print(profiling.formatear_informe())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
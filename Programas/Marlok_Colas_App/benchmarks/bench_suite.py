@@ -0,0 +1,250 @@
+# benchmarks/bench_suite.py
+#
+# Mide cómo escalan las funciones públicas de cálculo según el tamaño del problema
+# (número de estados, pasos, horizonte de simulación, dimensiones del juego).
+# Para cada caso y tamaño registra el tiempo por llamada, el rendimiento (unidades/s) y el
+# pico de memoria, añade la ejecución a un historial JSON y la compara con una línea base.
+# Cada llamada se hace con la misma semilla, así que las simulaciones repiten siempre la
+# misma trayectoria y el trabajo medido no cambia entre repeticiones ni entre ejecuciones.
+#
+# Uso (desde Programas/Marlok_Colas_App):
+#     python benchmarks/bench_suite.py                    # ejecuta y compara con la línea base
+#     python benchmarks/bench_suite.py --guardar-baseline # fija esta ejecución como línea base
+#     python benchmarks/bench_suite.py --rapido --filtro markov
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+DIRECTORIO_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRECTORIO_APP)
+
+import numpy as np
+
+from markov_chain import crear_matriz_transicion, simular_cadena_markov, calcular_distribucion_estado
+from queueing_theory import calcular_mm1_metrics, simular_mm1_fila
+from decision_games import calcular_valor_esperado, analizar_juego_normal_forma
+
+RUTA_HISTORIAL = os.path.join(DIRECTORIO_APP, "benchmarks", "historial_benchmarks.json")
+RUTA_BASELINE = os.path.join(DIRECTORIO_APP, "benchmarks", "baseline_benchmarks.json")
+
+
+# --- Preparación de datos ---
+
+def _matriz_aleatoria(num_estados):
+    matriz = np.random.rand(num_estados, num_estados)
+    return matriz / matriz.sum(axis=1, keepdims=True)
+
+def _caso_crear_matriz(num_estados):
+    estados = [f"E{i}" for i in range(num_estados)]
+    matriz = _matriz_aleatoria(num_estados)
+    probabilidades = {o: {d: matriz[i, j] for j, d in enumerate(estados)} for i, o in enumerate(estados)}
+    return (estados, probabilidades), num_estados * num_estados
+
+def _caso_simular_markov_pasos(num_pasos):
+    return (_matriz_aleatoria(5), 0, num_pasos), num_pasos
+
+def _caso_simular_markov_estados(num_estados):
+    return (_matriz_aleatoria(num_estados), 0, 2000), 2000
+
+def _caso_distribucion_estados(num_estados):
+    distribucion = np.zeros(num_estados)
+    distribucion[0] = 1.0
+    return (_matriz_aleatoria(num_estados), distribucion, 100), 100
+
+def _caso_distribucion_pasos(num_pasos):
+    distribucion = np.zeros(10)
+    distribucion[0] = 1.0
+    return (_matriz_aleatoria(10), distribucion, num_pasos), num_pasos
+
+def _caso_mm1_metrics(_):
+    return (5.0, 7.0), 1
+
+def _contar_eventos(resultado):
+    return len(resultado) - 1
+
+def _caso_simular_mm1(horizonte):
+    # El número de eventos depende de la trayectoria: se cuenta sobre el resultado
+    return (5.0, 7.0, horizonte), _contar_eventos
+
+def _caso_valor_esperado(num_estados):
+    probabilidades = np.random.rand(num_estados)
+    probabilidades /= probabilidades.sum()
+    return (probabilidades.tolist(), np.random.rand(num_estados).tolist()), num_estados
+
+def _caso_juego(dimension):
+    pagos_j1 = np.random.randint(0, 10, (dimension, dimension)).tolist()
+    pagos_j2 = np.random.randint(0, 10, (dimension, dimension)).tolist()
+    estrategias = [f"S{i}" for i in range(dimension)]
+    return (pagos_j1, pagos_j2, estrategias, estrategias), dimension * dimension
+
+# nombre del caso -> (función, preparación, tamaños, unidad del rendimiento)
+# La preparación devuelve (args, unidades); unidades puede ser una función que las cuenta sobre el resultado
+CASOS = {
+    "crear_matriz_transicion/estados": (crear_matriz_transicion, _caso_crear_matriz, [10, 50, 200], "celdas"),
+    "simular_cadena_markov/pasos": (simular_cadena_markov, _caso_simular_markov_pasos, [1000, 10000, 50000], "pasos"),
+    "simular_cadena_markov/estados": (simular_cadena_markov, _caso_simular_markov_estados, [2, 20, 200], "pasos"),
+    "calcular_distribucion_estado/estados": (calcular_distribucion_estado, _caso_distribucion_estados, [10, 100, 500], "pasos"),
+    "calcular_distribucion_estado/pasos": (calcular_distribucion_estado, _caso_distribucion_pasos, [10, 1000, 10000], "pasos"),
+    "calcular_mm1_metrics": (calcular_mm1_metrics, _caso_mm1_metrics, [1], "llamadas"),
+    "simular_mm1_fila/horizonte": (simular_mm1_fila, _caso_simular_mm1, [100, 1000, 10000], "eventos"),
+    "calcular_valor_esperado/estados": (calcular_valor_esperado, _caso_valor_esperado, [10, 1000, 100000], "estados"),
+    "analizar_juego_normal_forma/dimension": (analizar_juego_normal_forma, _caso_juego, [2, 10, 50, 100], "perfiles"),
+}
+
+
+# --- Medición ---
+
+def medir(funcion, args, unidades, semilla=0, tiempo_min=0.2, repeticiones_min=5):
+    """
+    Mide `funcion(*args)` repitiéndola hasta acumular `tiempo_min` segundos, fijando la semilla
+    antes de cada llamada para que todas hagan exactamente el mismo trabajo.
+    El pico de memoria se mide aparte, en una sola llamada, porque tracemalloc ralentiza el código.
+    :return: Diccionario con segundos por llamada (mediana, mínimo y media), rendimiento y pico de memoria.
+    """
+    # Llamada de calentamiento sin medir (cachés, asignaciones iniciales, frecuencia de la CPU)
+    np.random.seed(semilla)
+    funcion(*args)
+
+    tiempos = []
+    inicio_total = time.perf_counter()
+    while len(tiempos) < repeticiones_min or time.perf_counter() - inicio_total < tiempo_min:
+        np.random.seed(semilla)
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        tiempos.append(time.perf_counter() - inicio)
+
+    np.random.seed(semilla)
+    tracemalloc.start()
+    try:
+        funcion(*args)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    if callable(unidades):
+        unidades = unidades(resultado)
+    mediana = statistics.median(tiempos)
+    return {
+        "segundos_mediana": mediana,
+        "segundos_min": min(tiempos),
+        "segundos_media": sum(tiempos) / len(tiempos),
+        "repeticiones": len(tiempos),
+        "unidades": unidades,
+        "rendimiento": unidades / mediana if mediana > 0 else float("inf"),
+        "memoria_pico_bytes": pico,
+    }
+
+def medir_caso(nombre, tamano, semilla=0):
+    funcion, preparar, _, unidad = CASOS[nombre]
+    np.random.seed(semilla)
+    args, unidades = preparar(tamano)
+    medicion = medir(funcion, args, unidades, semilla)
+    medicion["unidad"] = unidad
+    return medicion
+
+def ejecutar_suite(filtro=None, rapido=False, semilla=0):
+    resultados = {}
+    for nombre, (funcion, preparar, tamanos, unidad) in CASOS.items():
+        if filtro and filtro not in nombre:
+            continue
+        resultados[nombre] = {}
+        for tamano in (tamanos[:2] if rapido else tamanos):
+            medicion = medir_caso(nombre, tamano, semilla)
+            resultados[nombre][str(tamano)] = medicion
+            print(f"{nombre:<40}{tamano:>8}  {medicion['segundos_mediana'] * 1000:10.3f} ms"
+                  f"  {medicion['rendimiento']:14,.0f} {unidad}/s  {medicion['memoria_pico_bytes'] / 1024:10.1f} KiB")
+    return resultados
+
+
+# --- Historial y comparación con la línea base ---
+
+def _leer_json(ruta, por_defecto):
+    if not os.path.exists(ruta):
+        return por_defecto
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+def _escribir_json(ruta, datos):
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=2, ensure_ascii=False)
+
+def comparar_con_baseline(resultados, baseline, tolerancia):
+    """
+    Compara la mediana del tiempo por llamada de cada caso con la línea base.
+    Si la base midió otra cantidad de trabajo (otra trayectoria), el caso no se compara.
+    :return: Lista de (caso, tamaño, razón actual/base) que superan 1 + tolerancia.
+    """
+    regresiones = []
+    for nombre, por_tamano in resultados.items():
+        for tamano, medicion in por_tamano.items():
+            base = baseline.get(nombre, {}).get(tamano)
+            if base is None or base.get("segundos_mediana", 0) <= 0:
+                continue
+            if base.get("unidades") != medicion["unidades"]:
+                print(f"{nombre:<40}{tamano:>8}  la línea base midió otro trabajo; vuelva a guardarla")
+                continue
+            razon = medicion["segundos_mediana"] / base["segundos_mediana"]
+            marca = ""
+            if razon > 1 + tolerancia:
+                regresiones.append((nombre, tamano, razon))
+                marca = "  <-- regresión"
+            print(f"{nombre:<40}{tamano:>8}  x{razon:6.2f} respecto a la línea base{marca}")
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de las funciones de cálculo.")
+    parser.add_argument("--filtro", help="Ejecuta solo los casos cuyo nombre contiene este texto")
+    parser.add_argument("--rapido", action="store_true", help="Usa solo los dos tamaños más pequeños de cada caso")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Margen antes de marcar una regresión (0.25 = 25%%)")
+    parser.add_argument("--guardar-baseline", action="store_true", help="Guarda esta ejecución como línea base")
+    parser.add_argument("--historial", default=RUTA_HISTORIAL)
+    parser.add_argument("--baseline", default=RUTA_BASELINE)
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar_suite(args.filtro, args.rapido)
+
+    historial = _leer_json(args.historial, [])
+    historial.append({
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "resultados": resultados,
+    })
+    _escribir_json(args.historial, historial)
+
+    if args.guardar_baseline:
+        baseline = _leer_json(args.baseline, {})
+        baseline.update(resultados)
+        _escribir_json(args.baseline, baseline)
+        print(f"\nLínea base guardada en {args.baseline}")
+        return 0
+
+    baseline = _leer_json(args.baseline, None)
+    if baseline is None:
+        print("\nNo hay línea base; ejecute con --guardar-baseline para crearla.")
+        return 0
+    print()
+    regresiones = comparar_con_baseline(resultados, baseline, args.tolerancia)
+    if regresiones:
+        # Una regresión solo cuenta si se repite al volver a medir el caso
+        print("\nVolviendo a medir los casos marcados para confirmarlos...")
+        repetidos = {}
+        for nombre, tamano, _ in regresiones:
+            repetidos.setdefault(nombre, {})[tamano] = medir_caso(nombre, int(tamano))
+        regresiones = comparar_con_baseline(repetidos, baseline, args.tolerancia)
+    if regresiones:
+        print(f"\n{len(regresiones)} regresiones por encima del {args.tolerancia:.0%} de tolerancia.")
+        return 1
+    print("\nSin regresiones respecto a la línea base.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# benchmarks/import_time.py
+#
+# Mide el tiempo de importación en frío de los módulos de cálculo y comprueba que no
+# arrastran dependencias de gráficos o de interfaz. Cada medición se hace en un proceso
+# nuevo y el resultado se añade a un historial JSON para seguir su evolución.
+#
+# Uso (desde Programas/Marlok_Colas_App):
+#     python benchmarks/import_time.py [--repeticiones 5] [--historial benchmarks/historial_importacion.json]
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+DIRECTORIO_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULOS_NUCLEO = ["markov_chain", "queueing_theory", "decision_games", "result_cache", "background_jobs"]
+MODULOS_CLI = ["main"]
+
+# Paquetes que el núcleo de cálculo no debe importar
+DEPENDENCIAS_PROHIBIDAS = ["matplotlib", "plotly", "streamlit", "pandas"]
+
+_SCRIPT_MEDICION = """
+import sys, time, json
+t0 = time.perf_counter()
+import {modulo}
+t1 = time.perf_counter()
+cargados = sorted({{m.split('.')[0] for m in sys.modules}})
+print(json.dumps({{"segundos": t1 - t0, "modulos": cargados}}))
+"""
+
+
+def medir_importacion(modulo, repeticiones=5):
+    """
+    Importa `modulo` en `repeticiones` procesos nuevos.
+    :return: Diccionario con la mediana y el mínimo en segundos y las dependencias prohibidas cargadas.
+    """
+    tiempos = []
+    prohibidas = set()
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, "-c", _SCRIPT_MEDICION.format(modulo=modulo)],
+            cwd=DIRECTORIO_APP, capture_output=True, text=True, check=True
+        )
+        datos = json.loads(salida.stdout.strip().splitlines()[-1])
+        tiempos.append(datos["segundos"])
+        prohibidas.update(m for m in datos["modulos"] if m in DEPENDENCIAS_PROHIBIDAS)
+    return {
+        "mediana_s": statistics.median(tiempos),
+        "minimo_s": min(tiempos),
+        "dependencias_prohibidas": sorted(prohibidas),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide el tiempo de importación en frío de los módulos.")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--historial", default=os.path.join(DIRECTORIO_APP, "benchmarks", "historial_importacion.json"))
+    args = parser.parse_args(argv)
+
+    resultados = {}
+    hay_errores = False
+    for modulo in MODULOS_NUCLEO + MODULOS_CLI:
+        resultado = medir_importacion(modulo, args.repeticiones)
+        resultados[modulo] = resultado
+        aviso = ""
+        if resultado["dependencias_prohibidas"]:
+            aviso = f"  <-- importa {', '.join(resultado['dependencias_prohibidas'])}"
+            hay_errores = True
+        print(f"{modulo:<18} mediana {resultado['mediana_s'] * 1000:8.1f} ms   mínimo {resultado['minimo_s'] * 1000:8.1f} ms{aviso}")
+
+    historial = []
+    if os.path.exists(args.historial):
+        with open(args.historial, encoding="utf-8") as f:
+            historial = json.load(f)
+    historial.append({
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "resultados": resultados,
+    })
+    with open(args.historial, "w", encoding="utf-8") as f:
+        json.dump(historial, f, indent=2, ensure_ascii=False)
+
+    if len(historial) > 1:
+        anterior = historial[-2]["resultados"]
+        for modulo, resultado in resultados.items():
+            if modulo in anterior:
+                cambio = resultado["mediana_s"] - anterior[modulo]["mediana_s"]
+                print(f"{modulo:<18} cambio respecto a la medición anterior: {cambio * 1000:+.1f} ms")
+
+    return 1 if hay_errores else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,10 @@
 # decision_games.py
 
 import numpy as np
-import pandas as pd
 
+from profiling import instrumentar, contar
+
+@instrumentar
 def calcular_valor_esperado(probabilidades, resultados):
     """
     Calcula el valor esperado para una decisión.
@@ -25,8 +27,11 @@ def matriz_pagos_a_dataframe(matriz_pagos, estrategias_filas, estrategias_column
     :param estrategias_columnas: Nombres de las estrategias del jugador de columna.
     :return: pandas.DataFrame
     """
+    # Importación diferida: el análisis del juego no necesita pandas
+    import pandas as pd
     return pd.DataFrame(matriz_pagos, index=estrategias_filas, columns=estrategias_columnas)
 
+@instrumentar
 def analizar_juego_normal_forma(matriz_pagos_jugador1, matriz_pagos_jugador2,
                                 estrategias_jugador1, estrategias_jugador2):
     """
@@ -42,6 +47,7 @@ def analizar_juego_normal_forma(matriz_pagos_jugador1, matriz_pagos_jugador2,
        num_estr_j2 != len(matriz_pagos_jugador1[0]):
         return {"error": "Las dimensiones de las matrices de pagos o estrategias no coinciden."}
 
+    contar("juegos_perfiles_evaluados", num_estr_j1 * num_estr_j2)
     equilibrios_nash = []
     # Buscar equilibrios de Nash (estrategia pura, muy simplificado)
     for i in range(num_estr_j1):
@@ -1,9 +1,14 @@
 
 
+import sys
+
 import numpy as np
 from markov_chain import crear_matriz_transicion, simular_cadena_markov, calcular_distribucion_estado
 from queueing_theory import calcular_mm1_metrics, simular_mm1_fila
-from visualizations import plot_markov_path, plot_queue_occupancy, plot_state_distribution
+import profiling
+
+# Las visualizaciones (plotly) se importan solo dentro de las demostraciones que las usan,
+# para que el menú arranque rápido.
 
 def main_menu():
     """
@@ -13,7 +18,8 @@ def main_menu():
         print("\n--- Programa de Teoria de Markov y Colas ---")
         print("1. Demostraciones de Cadena de Markov")
         print("2. Demostraciones de Teoria de Colas (M/M/1)")
-        print("3. Salir")
+        print("3. Métricas de rendimiento (perfilado)")
+        print("4. Salir")
 
         choice = input("Seleccione una opción: ")
 
@@ -22,12 +28,26 @@ def main_menu():
         elif choice == '2':
             run_queueing_demos()
         elif choice == '3':
+            show_profiling()
+        elif choice == '4':
             print("Salir")
             break
         else:
             print("Opción inválida. Por favor, intente de nuevo.")
 
+def show_profiling():
+    print("\n--- Métricas de rendimiento ---")
+    if not profiling.esta_activo():
+        profiling.activar()
+        print("Perfilado activado: las próximas demostraciones se medirán.")
+        print("Vuelva a esta opción después de ejecutarlas para ver el informe.")
+        return
+    print(profiling.formatear_informe())
+    input("Presione Enter para continuar...")
+
 def run_markov_demos():
+    from visualizations import plot_markov_path, plot_state_distribution
+
     print("\n--- Demostraciones de Cadena de Markov ---")
     estados_clima = ['Soleado', 'Nublado', 'Lluvioso']
     probabilidades_clima = {
@@ -52,6 +72,8 @@ def run_markov_demos():
 
 
 def run_queueing_demos():
+    from visualizations import plot_queue_occupancy
+
     print("\n--- Demostraciones de Teoria de Colas (M/M/1) ---")
     lambda_ejemplo = 5  
     mu_ejemplo = 7     
@@ -74,4 +96,9 @@ def run_queueing_demos():
     input("Presione Enter para continuar...")
 
 if __name__ == '__main__':
+    # Con argumentos se ejecuta un lote de escenarios sin menú (ver batch_runner.py):
+    #     python main.py escenarios.json resultados.csv [--procesos 4] [--reanudar] [--perfil]
+    if len(sys.argv) > 1:
+        from batch_runner import main as ejecutar_lote_cli
+        sys.exit(ejecutar_lote_cli(sys.argv[1:]))
     main_menu()
\ No newline at end of file
@@ -1,8 +1,10 @@
 
 
 import numpy as np
-import matplotlib.pyplot as plt 
 
+from profiling import instrumentar, contar
+
+@instrumentar
 def crear_matriz_transicion(estados, probabilidades): 
     n = len(estados)
     matriz = np.zeros((n, n))
@@ -15,30 +17,41 @@ def crear_matriz_transicion(estados, probabilidades):
             matriz[i, j] = prob
     return matriz
 
-def simular_cadena_markov(matriz_transicion, estado_inicial_idx, num_pasos, estados_nombres=None): 
+@instrumentar
+def simular_cadena_markov(matriz_transicion, estado_inicial_idx, num_pasos, estados_nombres=None, progreso=None): 
+    # progreso: función opcional que recibe la fracción completada (0.0 - 1.0)
     num_estados = matriz_transicion.shape[0]
     camino = [estado_inicial_idx]
     estado_actual_idx = estado_inicial_idx
+    paso_reporte = max(1, num_pasos // 100)
 
-    for _ in range(num_pasos):
+    for paso in range(num_pasos):
         siguiente_estado_idx = np.random.choice(
             num_estados,
             p=matriz_transicion[estado_actual_idx, :]
         )
         camino.append(siguiente_estado_idx)
         estado_actual_idx = siguiente_estado_idx
+        if progreso is not None and (paso + 1) % paso_reporte == 0:
+            progreso((paso + 1) / num_pasos)
+    contar("markov_pasos_simulados", num_pasos)
 
     if estados_nombres:
         return [estados_nombres[i] for i in camino]
     return camino
 
+@instrumentar
 def calcular_distribucion_estado(matriz_transicion, distribucion_inicial, num_pasos):
+    contar("markov_pasos_distribucion", num_pasos)
     distribucion_actual = distribucion_inicial
     for _ in range(num_pasos):
         distribucion_actual = np.dot(distribucion_actual, matriz_transicion)
     return distribucion_actual
 
 def visualizar_matriz(matriz, estados):
+    # Importación diferida: el resto del módulo no debe depender de matplotlib
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(len(estados)*0.8, len(estados)*0.8))
     cax = ax.matshow(matriz, cmap='Blues')
     fig.colorbar(cax)
@@ -0,0 +1,121 @@
+# profiling.py
+#
+# Instrumentación opcional (temporizadores y contadores) para las funciones de cálculo.
+# Está desactivada por defecto: se activa con profiling.activar() o con la variable de
+# entorno MARLOK_PERFIL=1. Desactivada, cada llamada instrumentada solo comprueba un booleano.
+
+import functools
+import os
+import threading
+import time
+
+_activo = os.environ.get("MARLOK_PERFIL", "") not in ("", "0")
+_tiempos = {}  # nombre -> [llamadas, total_s, max_s]
+_contadores = {}  # nombre -> cantidad
+_lock = threading.Lock()
+
+
+def activar():
+    global _activo
+    _activo = True
+
+def desactivar():
+    global _activo
+    _activo = False
+
+def esta_activo():
+    return _activo
+
+def reiniciar():
+    with _lock:
+        _tiempos.clear()
+        _contadores.clear()
+
+
+def instrumentar(funcion):
+    """
+    Decorador que mide el número de llamadas y el tiempo de `funcion` cuando el perfilado está activo.
+    Conserva el nombre de la función (lo usa la caché de resultados para sus claves).
+    """
+    nombre = funcion.__name__
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        if not _activo:
+            return funcion(*args, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            _registrar_tiempo(nombre, time.perf_counter() - inicio)
+    return envoltura
+
+def _registrar_tiempo(nombre, segundos):
+    with _lock:
+        registro = _tiempos.get(nombre)
+        if registro is None:
+            _tiempos[nombre] = [1, segundos, segundos]
+        else:
+            registro[0] += 1
+            registro[1] += segundos
+            registro[2] = max(registro[2], segundos)
+
+def contar(nombre, cantidad=1):
+    """Suma `cantidad` al contador `nombre` (ej: pasos simulados) si el perfilado está activo."""
+    if not _activo:
+        return
+    with _lock:
+        _contadores[nombre] = _contadores.get(nombre, 0) + cantidad
+
+
+def exportar():
+    """Devuelve una copia serializable de los datos acumulados (para enviarla entre procesos)."""
+    with _lock:
+        return {
+            "tiempos": {nombre: list(registro) for nombre, registro in _tiempos.items()},
+            "contadores": dict(_contadores),
+        }
+
+def combinar(datos):
+    """Acumula en este proceso los datos exportados por otro (ver exportar)."""
+    with _lock:
+        for nombre, (llamadas, total, maximo) in datos["tiempos"].items():
+            registro = _tiempos.setdefault(nombre, [0, 0.0, 0.0])
+            registro[0] += llamadas
+            registro[1] += total
+            registro[2] = max(registro[2], maximo)
+        for nombre, cantidad in datos["contadores"].items():
+            _contadores[nombre] = _contadores.get(nombre, 0) + cantidad
+
+
+def informe():
+    """
+    Resume los datos acumulados.
+    :return: Diccionario con "funciones" (llamadas, tiempo total, medio y máximo) y "contadores".
+    """
+    with _lock:
+        funciones = {
+            nombre: {
+                "llamadas": llamadas,
+                "total_s": total,
+                "media_s": total / llamadas,
+                "max_s": maximo,
+            }
+            for nombre, (llamadas, total, maximo) in sorted(_tiempos.items(), key=lambda e: -e[1][1])
+        }
+        return {"funciones": funciones, "contadores": dict(sorted(_contadores.items()))}
+
+def formatear_informe():
+    """Devuelve el informe como texto para la línea de comandos."""
+    datos = informe()
+    if not datos["funciones"] and not datos["contadores"]:
+        return "No hay datos de perfilado (¿está activado?)."
+    lineas = [f"{'Función':<30}{'Llamadas':>10}{'Total (s)':>12}{'Media (ms)':>12}{'Máx (ms)':>12}"]
+    for nombre, f in datos["funciones"].items():
+        lineas.append(f"{nombre:<30}{f['llamadas']:>10}{f['total_s']:>12.4f}{f['media_s'] * 1000:>12.3f}{f['max_s'] * 1000:>12.3f}")
+    if datos["contadores"]:
+        lineas.append("")
+        lineas.append(f"{'Contador':<30}{'Cantidad':>10}")
+        for nombre, cantidad in datos["contadores"].items():
+            lineas.append(f"{nombre:<30}{cantidad:>10}")
+    return "\n".join(lineas)
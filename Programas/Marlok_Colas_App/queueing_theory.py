@@ -3,6 +3,9 @@
 import numpy as np
 import math
 
+from profiling import instrumentar, contar
+
+@instrumentar
 def calcular_mm1_metrics(lambda_llegadas, mu_servicio):
     if lambda_llegadas >= mu_servicio:
         return {"error": "El sistema es inestable (tasa de llegada >= tasa de servicio)"}
@@ -28,12 +31,16 @@ def calcular_mm1_metrics(lambda_llegadas, mu_servicio):
         "tiempo_promedio_cola (Wq)": wq
     }
 
-def simular_mm1_fila(lambda_llegadas, mu_servicio, tiempo_simulacion_max):
+@instrumentar
+def simular_mm1_fila(lambda_llegadas, mu_servicio, tiempo_simulacion_max, progreso=None):
+    # progreso: función opcional que recibe la fracción de tiempo simulado (0.0 - 1.0)
     tiempos = [0.0]
     num_clientes = [0]
     tiempo_actual = 0.0
 
     while tiempo_actual < tiempo_simulacion_max:
+        if progreso is not None and len(tiempos) % 1000 == 0:
+            progreso(tiempo_actual / tiempo_simulacion_max)
 
         t_llegada = np.random.exponential(1.0 / lambda_llegadas)
         t_salida = float('inf') 
@@ -52,6 +59,7 @@ def simular_mm1_fila(lambda_llegadas, mu_servicio, tiempo_simulacion_max):
 
     if tiempos[-1] > tiempo_simulacion_max:
         tiempos[-1] = tiempo_simulacion_max
+    contar("colas_eventos_simulados", len(tiempos) - 1)
     return list(zip(tiempos, num_clientes))
 
 if __name__ == '__main__':
@@ -0,0 +1,162 @@
+# result_cache.py
+
+import copy
+import hashlib
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _normalizar(valor):
+    """
+    Convierte un parámetro en una estructura inmutable y serializable de forma estable,
+    para que dos llamadas con los mismos valores produzcan la misma clave.
+    """
+    if isinstance(valor, np.ndarray):
+        return ("ndarray", valor.dtype.str, valor.shape, valor.tobytes())
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, dict):
+        return ("dict", tuple(sorted((str(k), _normalizar(v)) for k, v in valor.items())))
+    if isinstance(valor, (list, tuple)):
+        return tuple(_normalizar(v) for v in valor)
+    return valor
+
+
+def clave_parametros(nombre_funcion, *args, **kwargs):
+    """
+    Genera la clave de caché de una llamada a partir del nombre de la función y sus parámetros.
+    :param nombre_funcion: Nombre que identifica el cálculo (ej: "simular_mm1_fila").
+    :return: Cadena hexadecimal con el hash de la llamada.
+    """
+    contenido = (nombre_funcion, _normalizar(args), _normalizar(kwargs))
+    return hashlib.sha1(pickle.dumps(contenido, protocol=4)).hexdigest()
+
+
+def _estimar_tamano(valor):
+    """
+    Estima (de forma aproximada y barata) los bytes que ocupa un resultado en memoria.
+    Para listas largas se extrapola a partir del primer elemento.
+    """
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(_estimar_tamano(k) + _estimar_tamano(v) for k, v in valor.items())
+    if isinstance(valor, (list, tuple)):
+        if not valor:
+            return sys.getsizeof(valor)
+        return sys.getsizeof(valor) + len(valor) * _estimar_elemento(valor[0])
+    return sys.getsizeof(valor)
+
+def _estimar_elemento(elemento):
+    # Un elemento tupla, como los pares (tiempo, clientes) de simular_mm1_fila, ocupa la tupla
+    # más cada uno de los valores que contiene (un float y un int no pesan lo mismo)
+    if isinstance(elemento, tuple):
+        return sys.getsizeof(elemento) + sum(sys.getsizeof(e) for e in elemento)
+    return _estimar_tamano(elemento)
+
+
+def congelar(valor):
+    """
+    Hace inmutable un resultado antes de compartirlo: los arrays pasan a solo lectura y las
+    listas a tuplas (sus elementos, como los pares (tiempo, clientes), ya son inmutables).
+    Los diccionarios se copian al entregarlos (ver entregar).
+    """
+    if isinstance(valor, np.ndarray):
+        valor.flags.writeable = False
+        return valor
+    if isinstance(valor, list):
+        return tuple(valor)
+    return valor
+
+def entregar(valor):
+    # Los diccionarios de resultados son pequeños: se entrega una copia para que nadie altere la guardada
+    if isinstance(valor, dict):
+        return copy.deepcopy(valor)
+    return valor
+
+
+class ResultCache:
+    """
+    Caché LRU de resultados, indexada por parámetros y segura entre hilos.
+    Se expulsan las entradas menos usadas cuando se supera el número máximo de entradas
+    o el tamaño máximo estimado en bytes.
+
+    Los resultados se comparten entre todas las sesiones, así que se guardan congelados:
+    los arrays son de solo lectura, las listas se devuelven como tuplas y los diccionarios como copias.
+    """
+
+    def __init__(self, max_entradas=256, max_bytes=256 * 1024 * 1024):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._entradas = OrderedDict()  # clave -> (valor, tamaño)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __contains__(self, clave):
+        with self._lock:
+            return clave in self._entradas
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entradas)
+
+    def obtener(self, clave, por_defecto=None):
+        with self._lock:
+            if clave not in self._entradas:
+                self.fallos += 1
+                return por_defecto
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return entregar(self._entradas[clave][0])
+
+    def guardar(self, clave, valor):
+        """Guarda el resultado congelado y lo devuelve (ver congelar)."""
+        valor = congelar(valor)
+        tamano = _estimar_tamano(valor)
+        with self._lock:
+            if clave in self._entradas:
+                self._bytes -= self._entradas.pop(clave)[1]
+            if tamano > self.max_bytes:
+                # Un resultado más grande que toda la caché no se guarda
+                return valor
+            self._entradas[clave] = (valor, tamano)
+            self._bytes += tamano
+            while len(self._entradas) > self.max_entradas or self._bytes > self.max_bytes:
+                _, (_, tamano_expulsado) = self._entradas.popitem(last=False)
+                self._bytes -= tamano_expulsado
+        return valor
+
+    def calcular(self, funcion, *args, **kwargs):
+        """
+        Devuelve el resultado guardado para funcion(*args, **kwargs) o lo calcula y lo guarda.
+        Las excepciones no se guardan: se propagan al llamador.
+        """
+        clave = clave_parametros(funcion.__name__, *args, **kwargs)
+        with self._lock:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return entregar(self._entradas[clave][0])
+            self.fallos += 1
+        resultado = self.guardar(clave, funcion(*args, **kwargs))
+        return entregar(resultado)
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "bytes_estimados": self._bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+            }
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los módulos de la aplicación están en el directorio padre (no es un paquete instalable)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("plotly")
+from streamlit.testing.v1 import AppTest
+
+RUTA_APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+@pytest.fixture
+def app():
+    # El primer envío arranca los procesos del pool, que tardan en importar numpy
+    return AppTest.from_file(RUTA_APP, default_timeout=60).run()
+
+def _sin_errores(app):
+    assert [e.value for e in app.exception] == []
+    assert [e.value for e in app.error] == []
+
+
+def test_la_pagina_se_carga(app):
+    _sin_errores(app)
+    assert app.title[0].value == "Explorador de Teorías: Markov, Colas y Decisiones/Juegos"
+
+def test_simulacion_markov_de_principio_a_fin(app):
+    app.button(key="load_markov_example").click().run()
+    app.button(key="btn_markov_simular").click().run()
+    _sin_errores(app)
+    assert app.session_state["tarea_markov"].terminada()
+    assert any(m.value.startswith("Camino simulado") for m in app.markdown)
+    assert len(app.dataframe) == 2  # matriz de transición y distribución final
+
+def test_simulacion_cola_de_principio_a_fin(app):
+    app.sidebar.radio[0].set_value("Teoría de Colas").run()
+    app.button(key="btn_simular_cola").click().run()
+    _sin_errores(app)
+    assert app.session_state["tarea_cola"].terminada()
+    tabla, = app.dataframe
+    assert list(tabla.value.columns) == ["Tiempo", "Clientes en Sistema"]
@@ -0,0 +1,108 @@
+import time
+
+import numpy as np
+import pytest
+
+import profiling
+from background_jobs import GestorTareas
+from markov_chain import simular_cadena_markov
+from queueing_theory import simular_mm1_fila
+from result_cache import ResultCache
+
+MATRIZ = np.array([[0.5, 0.5], [0.2, 0.8]])
+
+
+@pytest.fixture(scope="module")
+def gestor():
+    # Un solo pool para todo el módulo: arrancar procesos "spawn" cuesta cerca de un segundo
+    gestor = GestorTareas(ResultCache(), max_workers=2)
+    yield gestor
+    gestor.cerrar()
+
+@pytest.fixture
+def perfilado():
+    profiling.reiniciar()
+    profiling.activar()
+    yield
+    profiling.desactivar()
+    profiling.reiniciar()
+
+def _esperar_todas(gestor):
+    # _terminar se ejecuta justo después de que el future termina; la tarea deja de estar en curso al final
+    limite = time.monotonic() + 30
+    while gestor.tareas_en_curso() and time.monotonic() < limite:
+        time.sleep(0.01)
+    assert gestor.tareas_en_curso() == 0
+
+
+def test_el_perfilado_de_los_procesos_llega_al_proceso_principal(gestor, perfilado):
+    gestor.enviar(simular_cadena_markov, MATRIZ, 0, 500, semilla=11)
+    gestor.enviar(simular_mm1_fila, 5.0, 7.0, 50.0, semilla=11)
+    _esperar_todas(gestor)
+
+    datos = profiling.informe()
+    assert datos["funciones"]["simular_cadena_markov"]["llamadas"] == 1
+    assert datos["funciones"]["simular_mm1_fila"]["llamadas"] == 1
+    assert datos["contadores"]["markov_pasos_simulados"] == 500
+
+
+# Se ejecutan en los procesos del pool, que importan este módulo por su nombre
+
+def _lenta(pasos, progreso=None):
+    for i in range(pasos):
+        progreso(i / pasos)
+        time.sleep(0.01)
+    return pasos
+
+def _falla(progreso=None):
+    raise ValueError("fallo de prueba")
+
+
+def test_reutiliza_el_resultado_guardado_y_respeta_la_semilla(gestor):
+    primera = gestor.enviar(simular_mm1_fila, 5.0, 7.0, 50.0, semilla=3)
+    assert primera.esperar(timeout=30)
+    _esperar_todas(gestor)
+
+    repetida = gestor.enviar(simular_mm1_fila, 5.0, 7.0, 50.0, semilla=3)
+    assert repetida is not primera
+    assert repetida.terminada() and repetida.progreso == 1.0  # servida desde la caché, sin pasar por el pool
+    assert repetida.resultado() == primera.resultado()
+
+    otra = gestor.enviar(simular_mm1_fila, 5.0, 7.0, 50.0, semilla=4)
+    assert otra.esperar(timeout=30)
+    assert otra.resultado() != primera.resultado()
+
+def test_reutiliza_la_tarea_en_curso_y_solo_cancela_sin_interesados(gestor):
+    tarea = gestor.enviar(_lenta, 1000)
+    assert gestor.enviar(_lenta, 1000) is tarea
+    assert gestor.tareas_en_curso() == 1
+
+    tarea.cancelar()  # la otra sesión todavía espera el resultado
+    assert not tarea.esperar(timeout=0.3)
+    assert not tarea.cancelada()
+
+    tarea.cancelar()
+    assert tarea.esperar(timeout=30)
+    assert tarea.cancelada()
+    _esperar_todas(gestor)
+    assert tarea.clave not in gestor.cache
+
+def test_los_errores_se_propagan_y_no_se_guardan(gestor):
+    tarea = gestor.enviar(_falla)
+    assert tarea.esperar(timeout=30)
+    with pytest.raises(ValueError, match="fallo de prueba"):
+        tarea.resultado()
+    _esperar_todas(gestor)
+    assert tarea.clave not in gestor.cache
+
+    reintento = gestor.enviar(_falla)
+    assert reintento is not tarea
+    assert reintento.esperar(timeout=30)
+    with pytest.raises(ValueError):
+        reintento.resultado()
+
+def test_el_resultado_entregado_es_de_solo_lectura(gestor):
+    tarea = gestor.enviar(simular_cadena_markov, MATRIZ, 0, 50, ["A", "B"], semilla=5)
+    assert tarea.esperar(timeout=30)
+    camino = tarea.resultado()
+    assert isinstance(camino, tuple) and len(camino) == 51
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+import batch_runner
+
+
+def _escribir(ruta, texto):
+    ruta.write_text(texto, encoding="utf-8")
+    return str(ruta)
+
+def _fila(id_escenario):
+    return {"id": id_escenario, "tipo": "cola", "estado": "ok", "duracion_s": 0.1, "resultado": "{}", "error": ""}
+
+
+def test_cargar_escenarios_csv_solo_decodifica_listas_y_objetos(tmp_path):
+    ruta = _escribir(tmp_path / "escenarios.csv",
+                     'id,tipo,estados,matriz,estado_inicial,pasos\n'
+                     'a,markov,"[""1"",""2""]","[[0.5,0.5],[0.5,0.5]]",1,10\n')
+    escenario, = batch_runner.cargar_escenarios(ruta)
+    assert escenario["estados"] == ["1", "2"]
+    assert escenario["matriz"] == [[0.5, 0.5], [0.5, 0.5]]
+    assert escenario["estado_inicial"] == "1"
+    assert escenario["pasos"] == "10"
+
+def test_cargar_escenarios_json_asigna_ids_y_rechaza_repetidos(tmp_path):
+    ruta = _escribir(tmp_path / "escenarios.json", json.dumps({"escenarios": [{"tipo": "cola"}, {"tipo": "juego"}]}))
+    assert [e["id"] for e in batch_runner.cargar_escenarios(ruta)] == ["0", "1"]
+
+    ruta = _escribir(tmp_path / "repetidos.json", json.dumps([{"id": "x"}, {"id": "x"}]))
+    with pytest.raises(ValueError):
+        batch_runner.cargar_escenarios(ruta)
+
+
+def test_ejecutar_escenario_markov_resuelve_estado_inicial_por_nombre():
+    escenario = {"id": "m", "tipo": "markov", "estados": ["1", "2"],
+                 "matriz": [[1.0, 0.0], [0.0, 1.0]], "estado_inicial": "1", "pasos": "3"}
+    fila = batch_runner.ejecutar_escenario(escenario)
+    assert fila["estado"] == "ok"
+    assert json.loads(fila["resultado"])["distribucion_final"] == {"1": 1.0, "2": 0.0}
+
+def test_ejecutar_escenario_es_reproducible_con_la_misma_semilla():
+    escenario = {"id": "c", "tipo": "cola", "lambda": "2", "mu": "3", "tiempo_simulacion": "50"}
+    primera = batch_runner.ejecutar_escenario(escenario)
+    segunda = batch_runner.ejecutar_escenario(escenario)
+    assert primera["estado"] == "ok"
+    assert primera["resultado"] == segunda["resultado"]
+
+def test_ejecutar_escenario_registra_errores_sin_lanzarlos():
+    fila = batch_runner.ejecutar_escenario({"id": "c", "tipo": "cola", "lambda": 5, "mu": 3})
+    assert fila["estado"] == "error"
+    assert "inestable" in fila["error"]
+    assert batch_runner.ejecutar_escenario({"id": "x", "tipo": "otro"})["estado"] == "error"
+
+
+def test_escritor_csv_descarta_fila_cortada_al_reanudar(tmp_path):
+    ruta = str(tmp_path / "resultados.csv")
+    escritor = batch_runner.EscritorCSV(ruta)
+    escritor.abrir()
+    escritor.escribir(_fila("a"))
+    escritor.escribir(_fila("b"))
+    escritor.cerrar()
+    with open(ruta, "a", encoding="utf-8") as f:
+        f.write("c,cola,o")  # Corte a mitad de una fila
+
+    reanudado = batch_runner.EscritorCSV(ruta)
+    assert reanudado.ids_completados() == {"a", "b"}
+    reanudado.abrir()
+    reanudado.escribir(_fila("c"))
+    reanudado.cerrar()
+    assert reanudado.ids_completados() == {"a", "b", "c"}
+
+def test_escritor_parquet_recupera_filas_no_volcadas(tmp_path):
+    pytest.importorskip("pyarrow")
+    ruta = str(tmp_path / "resultados.parquet")
+    escritor = batch_runner.EscritorParquet(ruta, filas_por_archivo=3)
+    escritor.abrir()
+    for id_escenario in "abcde":
+        escritor.escribir(_fila(id_escenario))
+    # Sin cerrar: simula que el proceso muere con "d" y "e" aún sin volcar a un bloque
+
+    reanudado = batch_runner.EscritorParquet(ruta, filas_por_archivo=3)
+    assert reanudado.ids_completados() == set("abcde")
+    reanudado.abrir()
+    reanudado.escribir(_fila("f"))
+    reanudado.cerrar()
+    assert batch_runner.EscritorParquet(ruta).ids_completados() == set("abcdef")
+
+
+def test_main_reanuda_sin_repetir_escenarios(tmp_path, capsys):
+    escenarios = [{"id": f"c{i}", "tipo": "cola", "lambda": 2, "mu": 3} for i in range(4)]
+    entrada = _escribir(tmp_path / "escenarios.json", json.dumps(escenarios))
+    salida = str(tmp_path / "resultados.csv")
+
+    parcial = _escribir(tmp_path / "parcial.json", json.dumps(escenarios[:2]))
+    assert batch_runner.main([parcial, salida, "--procesos", "1"]) == 0
+    # Sin --reanudar no se toca una salida con resultados
+    assert batch_runner.main([entrada, salida, "--procesos", "1"]) == 1
+    assert batch_runner.main([entrada, salida, "--procesos", "1", "--reanudar"]) == 0
+    assert "2 ya completados, 2 por ejecutar" in capsys.readouterr().out
+
+    with open(salida, encoding="utf-8") as f:
+        ids = [linea.split(",")[0] for linea in f.read().splitlines()[1:]]
+    assert sorted(ids) == ["c0", "c1", "c2", "c3"]
@@ -0,0 +1,83 @@
+import sys
+
+import numpy as np
+import pytest
+
+from queueing_theory import simular_mm1_fila
+from result_cache import ResultCache, _estimar_tamano, clave_parametros
+
+
+def test_clave_parametros_depende_de_los_valores_no_de_los_objetos():
+    matriz = np.array([[0.5, 0.5], [0.1, 0.9]])
+    assert clave_parametros("f", matriz.copy(), pasos=10) == clave_parametros("f", matriz, pasos=10)
+    assert clave_parametros("f", [1, 2]) == clave_parametros("f", (1, 2))
+    assert clave_parametros("f", {"a": 1, "b": 2}) == clave_parametros("f", {"b": 2, "a": 1})
+    assert clave_parametros("f", matriz, pasos=10) != clave_parametros("f", matriz, pasos=11)
+    assert clave_parametros("f", 1) != clave_parametros("g", 1)
+
+
+def test_expulsa_la_entrada_menos_usada_al_superar_el_numero_de_entradas():
+    cache = ResultCache(max_entradas=2)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    assert cache.obtener("a") == 1  # "b" pasa a ser la menos usada
+    cache.guardar("c", 3)
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+
+def test_expulsa_entradas_al_superar_el_tamano_en_bytes():
+    cache = ResultCache(max_bytes=2000)
+    for clave in "abc":
+        cache.guardar(clave, np.zeros(100))  # 800 bytes cada una
+    assert len(cache) == 2
+    assert "a" not in cache
+    assert cache.estadisticas()["bytes_estimados"] == 1600
+
+def test_no_guarda_resultados_mas_grandes_que_la_cache():
+    cache = ResultCache(max_bytes=1000)
+    cache.guardar("pequeno", np.zeros(10))
+    valor = cache.guardar("grande", np.zeros(1000))
+    assert len(valor) == 1000
+    assert "grande" not in cache
+    assert "pequeno" in cache  # no se vacía la caché para hacerle sitio
+
+def test_estimar_tamano_cuenta_los_valores_de_cada_par():
+    np.random.seed(0)
+    resultado = simular_mm1_fila(5.0, 7.0, 100.0)
+    tiempo, clientes = resultado[0]
+    por_par = sys.getsizeof(resultado[0]) + sys.getsizeof(tiempo) + sys.getsizeof(clientes)
+    assert _estimar_tamano(resultado) == sys.getsizeof(resultado) + len(resultado) * por_par
+
+
+def test_los_resultados_se_guardan_congelados():
+    cache = ResultCache()
+    cache.guardar("array", np.arange(5))
+    with pytest.raises(ValueError):
+        cache.obtener("array")[0] = 10
+
+    cache.guardar("lista", [(0.0, 0), (1.0, 1)])
+    assert cache.obtener("lista") == ((0.0, 0), (1.0, 1))
+
+    cache.guardar("dict", {"rho": 0.5, "detalle": {"L": 1.0}})
+    copia = cache.obtener("dict")
+    copia["rho"] = 0.9
+    copia["detalle"]["L"] = 9.0
+    assert cache.obtener("dict") == {"rho": 0.5, "detalle": {"L": 1.0}}
+
+def test_calcular_reutiliza_resultados_y_no_guarda_excepciones():
+    llamadas = []
+    def cuadrado(x):
+        llamadas.append(x)
+        if x < 0:
+            raise ValueError("negativo")
+        return x * x
+
+    cache = ResultCache()
+    assert cache.calcular(cuadrado, 3) == 9
+    assert cache.calcular(cuadrado, 3) == 9
+    assert llamadas == [3]
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cache.calcular(cuadrado, -1)
+    assert llamadas == [3, -1, -1]
+    assert cache.estadisticas() == {"entradas": 1, "bytes_estimados": _estimar_tamano(9), "aciertos": 1, "fallos": 3}
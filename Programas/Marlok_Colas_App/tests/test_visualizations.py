@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+go = pytest.importorskip("plotly.graph_objects")
+
+import visualizations
+from visualizations import PIXELES_ANCHO, UMBRAL_WEBGL, _columnas_pixel, decimar_categorias, decimar_minmax
+
+
+@pytest.fixture(autouse=True)
+def sin_ventanas(monkeypatch):
+    # Las funciones de gráficos llaman a fig.show(); en las pruebas solo interesa la figura devuelta
+    monkeypatch.setattr(go.Figure, "show", lambda self, *args, **kwargs: None)
+
+def _trayectoria_cola(num_eventos, semilla=0):
+    rng = np.random.default_rng(semilla)
+    tiempos = np.cumsum(rng.exponential(0.1, num_eventos))
+    clientes = np.abs(np.cumsum(rng.choice([-1, 1], num_eventos)))
+    return tiempos, clientes
+
+def _extremos_por_columna(x, y, columnas_de):
+    columnas = _columnas_pixel(columnas_de, PIXELES_ANCHO)[np.searchsorted(columnas_de, x)]
+    return {c: (y[columnas == c].min(), y[columnas == c].max()) for c in np.unique(columnas)}
+
+
+def test_decimar_minmax_no_cambia_series_cortas():
+    x = np.arange(2 * PIXELES_ANCHO)
+    x_dec, y_dec = decimar_minmax(x, x * 2)
+    assert len(x_dec) == len(x)
+
+def test_decimar_minmax_conserva_minimo_y_maximo_de_cada_columna():
+    tiempos, clientes = _trayectoria_cola(10**6)
+    x_dec, y_dec = decimar_minmax(tiempos, clientes)
+
+    assert len(x_dec) <= 2 * PIXELES_ANCHO + 2
+    assert np.all(np.diff(x_dec) > 0)  # mismo orden que la serie original
+    assert (x_dec[0], x_dec[-1]) == (tiempos[0], tiempos[-1])
+    assert _extremos_por_columna(x_dec, y_dec, tiempos) == _extremos_por_columna(tiempos, clientes, tiempos)
+
+def test_decimar_categorias_conserva_cada_estado_de_cada_columna():
+    np.random.seed(0)
+    estados = np.random.choice(["A", "B", "C"], 10**5, p=[0.98, 0.01, 0.01])
+    pasos = np.arange(len(estados))
+    x_dec, y_dec = decimar_categorias(pasos, estados)
+
+    assert len(x_dec) <= 3 * PIXELES_ANCHO + 1
+    assert np.all(np.diff(x_dec) > 0)
+    columnas = _columnas_pixel(pasos, PIXELES_ANCHO)
+    assert set(zip(columnas[x_dec], y_dec)) == set(zip(columnas, estados))
+
+
+def test_plot_queue_occupancy_decima_trayectorias_largas_con_webgl():
+    tiempos, clientes = _trayectoria_cola(10**6)
+    fig = visualizations.plot_queue_occupancy(np.column_stack((tiempos, clientes)))
+
+    traza, = fig.data
+    assert isinstance(traza, go.Scattergl)
+    assert len(traza.x) <= 2 * PIXELES_ANCHO + 2
+    assert (min(traza.y), max(traza.y)) == (clientes.min(), clientes.max())
+
+def test_plot_markov_path_conserva_todos_los_estados_visitados():
+    camino = np.full(10**6, "Soleado", dtype=object)
+    camino[::3] = "Lluvioso"
+    camino[123457] = "Nublado"  # un único paso en todo el camino
+    fig = visualizations.plot_markov_path(camino.tolist())
+
+    traza, = fig.data
+    assert isinstance(traza, go.Scattergl)
+    assert len(traza.x) <= 3 * PIXELES_ANCHO + 1
+    assert set(traza.y) == {"Soleado", "Nublado", "Lluvioso"}
+
+@pytest.mark.parametrize("num_puntos, tipo", [(UMBRAL_WEBGL, go.Scatter), (UMBRAL_WEBGL + 1, go.Scattergl)])
+def test_se_usa_webgl_a_partir_del_umbral(num_puntos, tipo):
+    np.random.seed(0)
+    camino = np.random.randint(0, 3, num_puntos).tolist()
+    assert type(visualizations.plot_markov_path(camino).data[0]) is tipo
+
+    tiempos, clientes = _trayectoria_cola(num_puntos)
+    assert type(visualizations.plot_queue_occupancy(list(zip(tiempos, clientes))).data[0]) is tipo
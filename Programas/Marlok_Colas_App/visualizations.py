@@ -4,16 +4,82 @@ import plotly.graph_objects as go
 import plotly.express as px
 import numpy as np
 
+# Ancho aproximado del gráfico en píxeles: no tiene sentido dibujar más puntos que columnas en pantalla
+PIXELES_ANCHO = 1500
+# A partir de este número de puntos se usan trazas WebGL (Scattergl) en lugar de SVG
+UMBRAL_WEBGL = 5000
+
+def decimar_minmax(x, y, num_buckets=PIXELES_ANCHO):
+    """
+    Reduce una serie ordenada por x a como mucho 2 puntos por columna de píxeles,
+    conservando el mínimo y el máximo de cada columna para no perder picos ni valles.
+    :param x: Array de valores x ordenados de forma creciente.
+    :param y: Array de valores y numéricos, de la misma longitud que x.
+    :param num_buckets: Número de columnas (píxeles) en las que se divide el rango de x.
+    :return: Tupla (x, y) decimada, en el mismo orden que la serie original.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(x)
+    if n <= 2 * num_buckets or x[-1] == x[0]:
+        return x, y
+
+    columnas = _columnas_pixel(x, num_buckets)
+
+    # Ordenar por (columna, y): el primero de cada columna es el mínimo y el último el máximo
+    orden = np.lexsort((y, columnas))
+    inicios = np.flatnonzero(np.diff(columnas, prepend=-1))
+    finales = np.append(inicios[1:], n) - 1
+
+    indices = np.unique(np.concatenate((orden[inicios], orden[finales], [0, n - 1])))
+    return x[indices], y[indices]
+
+def decimar_categorias(x, y, num_buckets=PIXELES_ANCHO):
+    """
+    Reduce una serie de valores categóricos (estados) conservando, en cada columna de píxeles,
+    la primera aparición de cada estado distinto. A diferencia de decimar_minmax, no supone
+    ningún orden entre los valores, así que ningún estado visitado desaparece del gráfico.
+    :param x: Array de valores x ordenados de forma creciente.
+    :param y: Array de estados (nombres o índices), de la misma longitud que x.
+    :param num_buckets: Número de columnas (píxeles) en las que se divide el rango de x.
+    :return: Tupla (x, y) decimada, en el mismo orden que la serie original.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(x)
+    if n <= 2 * num_buckets or x[-1] == x[0]:
+        return x, y
+
+    columnas = _columnas_pixel(x, num_buckets)
+    unicos, codigos = np.unique(y, return_inverse=True)
+    # Una clave por par (columna, estado); np.unique devuelve el primer índice de cada par
+    _, primeros = np.unique(columnas * len(unicos) + codigos.ravel(), return_index=True)
+
+    indices = np.unique(np.append(primeros, n - 1))
+    return x[indices], y[indices]
+
+def _columnas_pixel(x, num_buckets):
+    # Columna de píxel de cada punto; como x está ordenado, las columnas son no decrecientes
+    bordes = np.linspace(x[0], x[-1], num_buckets + 1)
+    return np.clip(np.searchsorted(bordes, x, side='right') - 1, 0, num_buckets - 1)
+
 def plot_markov_path(path_states, title="Simulación de Cadena de Markov"):
     """
     Visualiza un camino simulado de una cadena de Markov.
+    Los caminos largos se reducen a la resolución de la pantalla y se dibujan con WebGL.
     """
-    if not path_states:
+    if len(path_states) == 0:
         print("No hay datos para visualizar el camino de Markov.")
         return
-    steps = list(range(len(path_states)))
+    estados = np.asarray(path_states)
+    num_puntos = len(estados)
 
-    fig = go.Figure(data=go.Scatter(x=steps, y=path_states, mode='lines+markers', name='Estados'))
+    if num_puntos <= UMBRAL_WEBGL:
+        fig = go.Figure(data=go.Scatter(x=np.arange(num_puntos), y=estados, mode='lines+markers', name='Estados'))
+    else:
+        # Los estados (con nombre o como índices) son categorías sin orden: no se usa min/max
+        pasos, y = decimar_categorias(np.arange(num_puntos), estados)
+        fig = go.Figure(data=go.Scattergl(x=pasos, y=y, mode='lines', name='Estados'))
     fig.update_layout(
         title=title,
         xaxis_title="Paso de Tiempo",
@@ -21,16 +87,24 @@ def plot_markov_path(path_states, title="Simulación de Cadena de Markov"):
         hovermode="x unified" 
     )
     fig.show()
+    return fig
 
 def plot_queue_occupancy(simulation_data, title="Ocupación de la Cola (M/M/1)"):
-    if not simulation_data:
+    """
+    Visualiza la ocupación de la cola a lo largo del tiempo.
+    :param simulation_data: Lista de pares (tiempo, clientes) o array de forma (n, 2).
+    Las trayectorias largas se reducen a la resolución de la pantalla y se dibujan con WebGL.
+    """
+    if len(simulation_data) == 0:
         print("No hay datos para visualizar la ocupación de la cola.")
         return
 
-    times = [data[0] for data in simulation_data]
-    num_clients = [data[1] for data in simulation_data]
+    # Un array (n, 2) se usa sin copiar; una lista de pares se convierte en una sola pasada
+    datos = np.asarray(simulation_data, dtype=float)
+    times, num_clients = decimar_minmax(datos[:, 0], datos[:, 1])
 
-    fig = go.Figure(data=go.Scatter(x=times, y=num_clients, mode='lines', fill='tozeroy', name='Clientes'))
+    scatter = go.Scattergl if len(datos) > UMBRAL_WEBGL else go.Scatter
+    fig = go.Figure(data=scatter(x=times, y=num_clients, mode='lines', fill='tozeroy', name='Clientes'))
     fig.update_layout(
         title=title,
         xaxis_title="Tiempo",
@@ -38,6 +112,7 @@ def plot_queue_occupancy(simulation_data, title="Ocupación de la Cola (M/M/1)")
         hovermode="x unified"
     )
     fig.show()
+    return fig
 
 def plot_state_distribution(distribution, states, title="Distribución de Estados de Markov"):
     """
@@ -55,6 +130,7 @@ def plot_state_distribution(distribution, states, title="Distribución de Estado
     )
     fig.update_layout(xaxis_tickangle=-45)
     fig.show()
+    return fig
 
 if __name__ == '__main__':
     print("Probando funciones de visualización (requiere datos de Markov y Colas)...")